@@ -10,15 +10,19 @@ Key differences:
    - This addition was made after discovering that PDF files were being incorrectly processed as HTML
    - The docling processor was failing when trying to parse these misidentified files
 4. Improved URL cleaning and validation
+5. Crawls asynchronously with aiohttp so many pages download concurrently
+   instead of waiting on one blocking request at a time
 """
 
 import os
 import sys
 import shutil
 import argparse
-import requests
+import asyncio
+import aiohttp
 import mimetypes
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse, unquote
 from my_config import MY_CONFIG
 import logging
@@ -26,6 +30,18 @@ import logging
 # Configure logging to the WARN level
 logging.basicConfig(level=logging.WARN)
 
+# Number of concurrent worker tasks / in-flight requests
+MAX_CONCURRENCY = 32
+
+# Only materialize anchor tags when parsing a page for links
+ONLY_LINKS = SoupStrainer('a', href=True)
+
+@lru_cache(maxsize=8192)
+def parse_url(url):
+    """Cached urlparse - the same URL gets parsed by both clean_url and
+    is_valid_url, and popular links show up on many pages."""
+    return urlparse(url)
+
 class WebsiteCrawler:
     def __init__(self, start_url, max_depth, max_downloads, output_folder):
         self.start_url = start_url
@@ -35,23 +51,25 @@ class WebsiteCrawler:
         self.visited_urls = set()
         self.download_count = 0
         self.domain = urlparse(start_url).netloc
+        # Queue of (url, depth) work items shared by the workers
+        self.queue = asyncio.Queue()
 
     def clean_url(self, url):
         """Clean and validate the URL."""
         # Remove any whitespace and non-breaking spaces
         url = url.strip().replace('\xa0', '')
-        
+
         # Basic URL validation - must start with http:// or https://
         if not url.startswith(('http://', 'https://')):
             return None
-            
+
         # Parse the URL
-        parsed = urlparse(url)
-        
+        parsed = parse_url(url)
+
         # Check if it's a valid URL (not a text snippet)
         if len(parsed.path) > 500 or ' ' in parsed.path:
             return None
-            
+
         # Remove duplicate domains in path
         path_parts = parsed.path.split('/')
         clean_parts = []
@@ -59,18 +77,18 @@ class WebsiteCrawler:
             if self.domain not in part:
                 clean_parts.append(part)
         clean_path = '/'.join(clean_parts)
-        
+
         # Reconstruct the URL
         clean_url = f"{parsed.scheme}://{parsed.netloc}{clean_path}"
         if parsed.query:
             clean_url += f"?{parsed.query}"
-            
+
         return clean_url
 
     def is_valid_url(self, url):
         """Check if URL is valid and belongs to the same domain."""
         try:
-            parsed = urlparse(url)
+            parsed = parse_url(url)
             return parsed.netloc == self.domain
         except:
             return False
@@ -86,15 +104,21 @@ class WebsiteCrawler:
             return content_type
 
         # If no Content-Type header, try to guess from the URL
-        url_path = urlparse(response.url).path
+        url_path = urlparse(str(response.url)).path
         mime_type, _ = mimetypes.guess_type(url_path)
         return mime_type or 'application/octet-stream'
 
-    def save_content(self, url, response, mime_type):
+    def save_content(self, url, text, data, mime_type):
         """
         Save the content based on its MIME type.
         This method handles different file types appropriately.
         """
+        # Re-check the download cap here: up to MAX_CONCURRENCY requests are
+        # in flight at once, so the check at the start of process_url alone
+        # would let the crawl overshoot the limit
+        if self.download_count >= self.max_downloads:
+            return False
+
         # Create filename from URL
         filename = url.replace(self.start_url, '').strip('/')
         if not filename:
@@ -103,17 +127,18 @@ class WebsiteCrawler:
 
         # Handle different MIME types
         if mime_type == 'text/html':
-            # For HTML, use BeautifulSoup to prettify and save as HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # For HTML, save the response body verbatim - the processing
+            # step re-parses these files anyway, so a prettify round-trip
+            # would only cost a parse + serialize and inflate the files
             filename = filename + '_text.html'
-            content = soup.prettify()
+            content = text
             mode = 'w'
             encoding = 'utf-8'
         else:
             # For non-HTML files (PDFs, images, etc.), save as binary
             ext = mimetypes.guess_extension(mime_type) or '.bin'
             filename = filename + ext
-            content = response.content
+            content = data
             mode = 'wb'
             encoding = None
 
@@ -125,8 +150,8 @@ class WebsiteCrawler:
         self.download_count += 1
         return True
 
-    def crawl(self, url, depth=0):
-        """Crawl the website starting from the given URL."""
+    async def process_url(self, session, sem, url, depth):
+        """Download a single URL and enqueue any links found in it."""
         if depth > self.max_depth or self.download_count >= self.max_downloads:
             return
 
@@ -135,31 +160,83 @@ class WebsiteCrawler:
         if not url or not self.is_valid_url(url):
             return
 
+        # Workers all run on one event loop thread, so checking and adding
+        # to visited_urls here is race-free without a lock
         if url in self.visited_urls:
             return
 
         self.visited_urls.add(url)
 
         try:
-            response = requests.get(url)
-            response.raise_for_status()
+            async with sem, session.get(url) as response:
+                response.raise_for_status()
+
+                # Get MIME type and read the body while the connection is open
+                mime_type = self.get_mime_type(response)
+                data = await response.read()
+                text = await response.text() if mime_type == 'text/html' else None
 
-            # Get MIME type and save content accordingly
-            mime_type = self.get_mime_type(response)
-            self.save_content(url, response, mime_type)
+            self.save_content(url, text, data, mime_type)
 
-            # Only look for links in HTML content
-            if mime_type == 'text/html':
-                soup = BeautifulSoup(response.text, 'html.parser')
+            # Only look for links in HTML content, and only enqueue them if
+            # the next level is still within the depth limit - leaf links
+            # would just be dropped on dequeue anyway
+            if mime_type == 'text/html' and depth + 1 <= self.max_depth:
+                # SoupStrainer keeps the parser from building the full DOM
+                # just to enumerate anchors
+                soup = BeautifulSoup(text, 'lxml', parse_only=ONLY_LINKS)
                 for link in soup.find_all('a'):
                     href = link.get('href')
                     if href:
                         absolute_url = urljoin(url, href)
-                        self.crawl(absolute_url, depth + 1)
+                        await self.queue.put((absolute_url, depth + 1))
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logging.warning(f"Error crawling {url}: {e}")
 
+    async def crawl_worker(self, session, sem):
+        """Pull (url, depth) items off the queue until cancelled."""
+        while True:
+            url, depth = await self.queue.get()
+            try:
+                await self.process_url(session, sem, url, depth)
+            except Exception as e:
+                # An unexpected per-URL failure (decode error, bad filename,
+                # ...) must cost one page, not kill the worker - a dead
+                # worker would shrink the pool silently and can hang the
+                # queue.join() shutdown
+                logging.warning(f"Unexpected error processing {url}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def crawl(self):
+        """Crawl the website starting from the start URL."""
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+        # One shared session for the whole crawl: keep-alive means pooled
+        # sockets get reused instead of paying a TCP+TLS handshake per URL,
+        # since every request targets the same domain
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONCURRENCY,
+            limit_per_host=8,
+            keepalive_timeout=60,
+            ssl=False,
+        )
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await self.queue.put((self.start_url, 0))
+
+            # Launch the worker pool; the queue drives all of them
+            workers = [
+                asyncio.create_task(self.crawl_worker(session, sem))
+                for _ in range(MAX_CONCURRENCY)
+            ]
+
+            # Wait until every queued URL has been processed, then shut down
+            await self.queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
 def main():
     parser = argparse.ArgumentParser(description='Crawl a website and save HTML content')
     parser.add_argument('--url', required=True, help='Starting URL to crawl')
@@ -173,7 +250,7 @@ def main():
 
     # Initialize and run crawler
     crawler = WebsiteCrawler(args.url, args.max_depth, args.max_downloads, output_dir)
-    crawler.crawl(args.url)
+    asyncio.run(crawler.crawl())
 
 if __name__ == '__main__':
-    main() 
+    main()
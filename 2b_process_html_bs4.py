@@ -6,39 +6,54 @@ This script is designed to work with HTML files crawled by the BS4 crawler (1_cr
 import os
 import sys
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Tuple
 from my_config import MY_CONFIG
-import json
+
+# orjson serializes several times faster than stdlib json and emits
+# bytes directly; fall back to stdlib when it is not installed
+try:
+    import orjson
+
+    def dumps_jsonl(doc: Dict[str, Any]) -> bytes:
+        return orjson.dumps(doc) + b'\n'
+except ImportError:
+    import json
+
+    def dumps_jsonl(doc: Dict[str, Any]) -> bytes:
+        return json.dumps(doc).encode('utf-8') + b'\n'
 
 def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
     """Split text into overlapping chunks."""
     chunks = []
-    start = 0
     text_len = len(text)
-    
-    while start < text_len:
-        end = start + chunk_size
-        # If this is not the first chunk, include overlap from previous chunk
-        if start > 0:
-            start = start - overlap
+
+    # Advance by a fixed stride so each chunk overlaps the previous one by
+    # `overlap` characters; the old in-loop start mutation produced uneven
+    # windows that re-scanned already-chunked text
+    stride = max(1, chunk_size - overlap)
+    for start in range(0, text_len, stride):
+        end = min(start + chunk_size, text_len)
         # If this is not the last chunk, try to break at a sentence boundary
         if end < text_len:
-            # Look for sentence boundaries (., !, ?) followed by whitespace
-            for i in range(min(end + 100, text_len) - 1, end - 100, -1):
-                if i > 0 and text[i] in '.!?' and text[i + 1].isspace():
-                    end = i + 1
-                    break
+            # Probe the window for '. ', '! ' and '? ' with rfind and take
+            # the last boundary found - three C-level scans, no regex
+            # machinery and no intermediate window string
+            window_lo = max(end - 100, 0)
+            window_hi = min(end + 100, text_len)
+            best = max(text.rfind('. ', window_lo, window_hi),
+                       text.rfind('! ', window_lo, window_hi),
+                       text.rfind('? ', window_lo, window_hi))
+            if best != -1:
+                end = best + 1
         chunk = text[start:end].strip()
         if chunk:
             chunks.append(chunk)
-        start = end
     return chunks
 
-def extract_metadata(html_content: str, file_path: str) -> Dict[str, Any]:
-    """Extract metadata from HTML content."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
+def extract_metadata(soup: BeautifulSoup, file_path: str) -> Dict[str, Any]:
+    """Extract metadata from parsed HTML content."""
     # Get title
     title = soup.title.string if soup.title else ''
     
@@ -75,17 +90,13 @@ def html_to_markdown(soup: BeautifulSoup) -> str:
     if not main_content:
         return ""
 
-    # Extract text while preserving important structure
+    # Extract text while preserving important structure, walking the tree
+    # once in document order instead of once per tag family - this also
+    # keeps headings, paragraphs, lists and links in natural reading order
     markdown_lines = []
-    
-    # Process headings
-    for tag in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-        level = int(tag.name[1])
-        markdown_lines.append('#' * level + ' ' + tag.get_text().strip())
-        markdown_lines.append('')
-    
-    # Process paragraphs and lists
-    for tag in main_content.find_all(['p', 'ul', 'ol']):
+
+    for tag in main_content.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+                                      'p', 'ul', 'ol', 'a']):
         if tag.name == 'p':
             text = tag.get_text().strip()
             if text:
@@ -97,14 +108,17 @@ def html_to_markdown(soup: BeautifulSoup) -> str:
                 if text:
                     markdown_lines.append(f"- {text}")
             markdown_lines.append('')
-    
-    # Process links
-    for link in main_content.find_all('a'):
-        text = link.get_text().strip()
-        href = link.get('href', '')
-        if text and href:
-            markdown_lines.append(f"[{text}]({href})")
-    
+        elif tag.name == 'a':
+            text = tag.get_text().strip()
+            href = tag.get('href', '')
+            if text and href:
+                markdown_lines.append(f"[{text}]({href})")
+        else:
+            # Headings
+            level = int(tag.name[1])
+            markdown_lines.append('#' * level + ' ' + tag.get_text().strip())
+            markdown_lines.append('')
+
     return '\n'.join(markdown_lines)
 
 def process_html_file(html_file: str) -> List[Dict[str, Any]]:
@@ -112,11 +126,11 @@ def process_html_file(html_file: str) -> List[Dict[str, Any]]:
     with open(html_file, 'r', encoding='utf-8') as f:
         html_content = f.read()
     
-    # Parse HTML with BeautifulSoup
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
+    # Parse HTML with BeautifulSoup (once - metadata extraction reuses this tree)
+    soup = BeautifulSoup(html_content, 'lxml')
+
     # Extract metadata
-    metadata = extract_metadata(html_content, html_file)
+    metadata = extract_metadata(soup, html_file)
     
     # Convert HTML to markdown
     markdown_content = html_to_markdown(soup)
@@ -148,32 +162,39 @@ def main():
     
     # Process all HTML files from BS4 crawler
     input_path = os.path.join(MY_CONFIG.CRAWL_DIR)
-    html_files = [f for f in os.listdir(input_path) 
-                 if f.endswith('_text.html')]
+    # scandir yields entries with the name, path and file type already
+    # cached from the directory read - no extra stat or join per file
+    entries = [e for e in os.scandir(input_path)
+               if e.is_file() and e.name.endswith('_text.html')]
+    html_files = [e.name for e in entries]
     print(f"Found {len(html_files)} HTML files to process")
-    
+
+    # Parsing is CPU-bound pure Python, so fan the files out across cores;
+    # each file is independent. Side-effect writes stay in the parent.
+    file_paths = [e.path for e in entries]
     all_documents = []
-    for html_file in html_files:
-        file_path = os.path.join(input_path, html_file)
-        documents = process_html_file(file_path)
-        all_documents.extend(documents)
-        
-        # Save the first chunk as a markdown file for reference
-        if documents:
-            md_file_name = os.path.join(
-                MY_CONFIG.PROCESSED_DATA_DIR, 
-                f"{os.path.splitext(html_file)[0]}.md"
-            )
-            with open(md_file_name, 'w', encoding='utf-8') as md_file:
-                md_file.write(documents[0]['content'])
-        
-        print(f"Processed HTML '{html_file}' into {len(documents)} chunks")
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(process_html_file, file_paths, chunksize=4)
+        for html_file, documents in zip(html_files, results):
+            all_documents.extend(documents)
+
+            # Save the first chunk as a markdown file for reference
+            if documents:
+                md_file_name = os.path.join(
+                    MY_CONFIG.PROCESSED_DATA_DIR,
+                    f"{os.path.splitext(html_file)[0]}.md"
+                )
+                with open(md_file_name, 'w', encoding='utf-8') as md_file:
+                    md_file.write(documents[0]['content'])
+
+            print(f"Processed HTML '{html_file}' into {len(documents)} chunks")
     
     # Save all documents with metadata for the graph database
     docs_file = os.path.join(MY_CONFIG.PROCESSED_DATA_DIR, 'processed_documents.jsonl')
-    with open(docs_file, 'w', encoding='utf-8') as f:
-        for doc in all_documents:
-            f.write(json.dumps(doc) + '\n')
+    # Large write buffer + writelines batches the dump into a few big
+    # write() calls instead of one small write per document
+    with open(docs_file, 'wb', buffering=1 << 20) as f:
+        f.writelines(dumps_jsonl(doc) for doc in all_documents)
     
     print(f"✅ Created {len(all_documents)} document chunks from {len(html_files)} HTML files")
     print(f"✅ Saved document chunks to {docs_file}")
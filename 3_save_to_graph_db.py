@@ -7,27 +7,35 @@ This file saves the text recieved from beautifulsoups' crawler and saves it to t
 
 
 import os
-import json
 from pathlib import Path
-from typing import List, Dict, Any
-from tqdm import tqdm
+from typing import Iterator, Dict, Any
 
 from my_config import MY_CONFIG
 from graphrag_utils import GraphRAGManager
 
-def load_processed_documents() -> List[Dict[str, Any]]:
-    """Load processed documents from JSONL file."""
+# orjson parses several times faster than stdlib json; fall back to
+# stdlib when it is not installed
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    import json
+    loads = json.loads
+
+def iter_processed_documents() -> Iterator[Dict[str, Any]]:
+    """Yield processed documents one at a time from the JSONL file.
+
+    A generator keeps peak memory flat - the graph loader consumes and
+    discards one batch of documents at a time instead of holding the
+    whole crawl in a list.
+    """
     docs_file = os.path.join(MY_CONFIG.PROCESSED_DATA_DIR, 'processed_documents.jsonl')
-    documents = []
-    
+
     with open(docs_file, 'r', encoding='utf-8') as f:
         for line in f:
-            doc = json.loads(line)
-            documents.append(doc)
-    
-    return documents
+            yield loads(line)
 
-def save_to_graph_db(documents: List[Dict[str, Any]]):
+def save_to_graph_db(documents: Iterator[Dict[str, Any]]):
     """Save documents to Neo4j using GraphRAG."""
     graph_manager = GraphRAGManager()
     
@@ -42,12 +50,8 @@ def save_to_graph_db(documents: List[Dict[str, Any]]):
 
 def main():
     """Main function to load processed documents and save them to Neo4j."""
-    print("\nLoading processed documents...")
-    documents = load_processed_documents()
-    print(f"✅ Loaded {len(documents)} document chunks")
-    
-    print("\nSaving to Neo4j graph database...")
-    save_to_graph_db(documents)
+    print("\nSaving processed documents to Neo4j graph database...")
+    save_to_graph_db(iter_processed_documents())
     print("Done!")
 
 if __name__ == "__main__":
@@ -11,43 +11,46 @@ from typing import List, Dict, Any
 from my_config import MY_CONFIG
 from graphrag_utils import GraphRAGManager
 
-def query_knowledge_graph(query_text: str, top_k: int = 5) -> str:
+def query_knowledge_graph(graph_manager: GraphRAGManager, query_text: str, top_k: int = 5) -> str:
     """
     Query the knowledge graph using GraphRAG.
-    
+
     Args:
+        graph_manager: An initialized GraphRAGManager to query with
         query_text: The query text
         top_k: Number of results to return
-        
+
     Returns:
         Answer from the LLM based on retrieved context
     """
-    graph_manager = GraphRAGManager()
-    try:
-        return graph_manager.query(query_text, top_k=top_k)
-    finally:
-        graph_manager.close()
+    return graph_manager.query(query_text, top_k=top_k)
 
 def main():
     """Main function to handle queries."""
     print("AllyCat GraphRAG Query")
     print("Type 'exit' to quit\n")
-    
-    while True:
-        query = input("\nEnter your question: ").strip()
-        
-        if query.lower() == 'exit':
-            break
-        
-        if not query:
-            continue
-        
-        print("\nSearching knowledge graph and generating answer...")
-        answer = query_knowledge_graph(query)
-        
-        print("\nAnswer:")
-        print(answer)
-        print("\n" + "-"*50)
+
+    # One manager for the whole session - the embedding model and index
+    # setup are only initialized once, not per question
+    graph_manager = GraphRAGManager()
+    try:
+        while True:
+            query = input("\nEnter your question: ").strip()
+
+            if query.lower() == 'exit':
+                break
+
+            if not query:
+                continue
+
+            print("\nSearching knowledge graph and generating answer...")
+            answer = query_knowledge_graph(graph_manager, query)
+
+            print("\nAnswer:")
+            print(answer)
+            print("\n" + "-"*50)
+    finally:
+        graph_manager.close()
 
 if __name__ == "__main__":
     main() 
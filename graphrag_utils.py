@@ -1,5 +1,9 @@
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any
+import functools
 import logging
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
 from neo4j import GraphDatabase
 from neo4j_graphrag.generation import GraphRAG, RagTemplate
 from neo4j_graphrag.retrievers import VectorRetriever
@@ -11,6 +15,15 @@ from my_config import MY_CONFIG
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Number of document rows created per write transaction
+WRITE_BATCH_SIZE = 500
+
+@functools.lru_cache(maxsize=1)
+def _get_embedder(model_name):
+    """Load the sentence-transformer model once per process - it costs
+    seconds and hundreds of MB, and every GraphRAGManager shares it."""
+    return SentenceTransformerEmbeddings(model_name)
+
 class GraphRAGManager:
     def __init__(self):
         self.uri = MY_CONFIG.NEO4J_URI
@@ -25,15 +38,13 @@ class GraphRAGManager:
             auth=(self.user, self.password)
         )
         
-        # Create vector index if it doesn't exist
+        # Create vector index if it doesn't exist. Creation is idempotent
+        # so constructing a manager never drops an index that already holds
+        # vectors (the query REPL builds managers repeatedly)
         with self.driver.session(database=self.database) as session:
-            logger.info("Creating vector index...")
-            # Drop existing index if it exists
-            session.run(f'DROP INDEX `{MY_CONFIG.NEO4J_VECTOR_INDEX}` IF EXISTS')
-            
-            # Create new vector index
+            logger.info("Creating vector index if it does not exist...")
             session.run(f"""
-            CREATE VECTOR INDEX `{MY_CONFIG.NEO4J_VECTOR_INDEX}`
+            CREATE VECTOR INDEX `{MY_CONFIG.NEO4J_VECTOR_INDEX}` IF NOT EXISTS
             FOR (n:Document)
             ON (n.embedding)
             OPTIONS {{indexConfig: {{
@@ -44,7 +55,7 @@ class GraphRAGManager:
         
         logger.info("Initializing embeddings...")
         # Initialize embeddings using HuggingFace model via sentence-transformers
-        self.embeddings = SentenceTransformerEmbeddings(MY_CONFIG.EMBEDDING_MODEL)
+        self.embeddings = _get_embedder(MY_CONFIG.EMBEDDING_MODEL)
         
         logger.info("Initializing vector retriever...")
         # Initialize vector retriever
@@ -97,44 +108,87 @@ Answer (using ONLY information from the context above):"""
         
         logger.info("Initialization complete!")
     
-    def create_knowledge_graph(self, documents: List[Dict[str, Any]]):
+    def create_knowledge_graph(self, documents: Iterable[Dict[str, Any]]):
         """
         Create a knowledge graph from the processed documents.
-        
+
         Args:
-            documents: List of document dictionaries with 'content' and 'metadata'
+            documents: Iterable of document dictionaries with 'content' and
+                'metadata'. Can be a generator - documents are consumed one
+                batch at a time so peak memory stays flat for large crawls.
         """
-        logger.info(f"Creating knowledge graph from {len(documents)} documents...")
-        for doc in documents:
-            content = doc['content']
+        logger.info("Creating knowledge graph...")
+        # A single-worker executor dedicated to DB writes pipelines the two
+        # stages: while batch N embeds on the main thread, batch N-1 commits
+        # to Neo4j. All queries run on the writer thread, so the shared
+        # session is never used from two threads at once.
+        with self.driver.session(database=self.database) as session, \
+                ThreadPoolExecutor(max_workers=1) as db_writer, \
+                tqdm(desc="Saving documents", unit="doc") as progress:
+            # At most one outstanding write: waiting on the previous batch
+            # before submitting the next bounds the pipeline to two batches
+            # of rows in memory, preserving the flat-memory guarantee
+            pending = None
+            batch = []
+            for doc in documents:
+                batch.append(doc)
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    rows = self._embed_batch(batch)
+                    batch = []
+                    if pending is not None:
+                        pending.result()
+                    pending = db_writer.submit(self._write_rows, session, rows, progress)
+            if batch:
+                rows = self._embed_batch(batch)
+                if pending is not None:
+                    pending.result()
+                pending = db_writer.submit(self._write_rows, session, rows, progress)
+
+            # Surface any write errors before the session closes
+            if pending is not None:
+                pending.result()
+            total = progress.n
+        logger.info(f"Knowledge graph creation complete! ({total} documents)")
+
+    def _embed_batch(self, batch):
+        """Embed one batch of documents and build their parameter rows."""
+        # Embed the whole batch in one call - a single batched forward pass
+        # is far faster than one embed_query call per document
+        contents = [doc['content'] for doc in batch]
+        vectors = self.embeddings.model.encode(contents, batch_size=64)
+
+        # L2-normalize once at write time so the cosine computation in the
+        # index degenerates to a plain dot product server-side. The FP16
+        # cast only rounds the values before they are sent - the driver
+        # still transmits them as 64-bit floats
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = (vectors / norms).astype(np.float16)
+
+        rows = []
+        for doc, vector in zip(batch, vectors):
             metadata = doc.get('metadata', {})
-            
-            # Create document node with embeddings
-            vector = self.embeddings.embed_query(content)
-            
-            # Create the document node with vector embedding
-            with self.driver.session(database=self.database) as session:
-                session.run(
-                    """
-                    CREATE (d:Document {
-                        content: $content,
-                        source: $source,
-                        title: $title,
-                        filename: $filename,
-                        last_modified: $last_modified,
-                        created: $created,
-                        embedding: $embedding
-                    })
-                    """,
-                    content=content,
-                    source=metadata.get('source', ''),
-                    title=metadata.get('title', ''),
-                    filename=metadata.get('filename', ''),
-                    last_modified=metadata.get('last_modified', ''),
-                    created=metadata.get('created', ''),
-                    embedding=vector
-                )
-        logger.info("Knowledge graph creation complete!")
+            rows.append({
+                'content': doc['content'],
+                'source': metadata.get('source', ''),
+                'title': metadata.get('title', ''),
+                'filename': metadata.get('filename', ''),
+                'last_modified': metadata.get('last_modified', ''),
+                'created': metadata.get('created', ''),
+                'embedding': vector.tolist()
+            })
+        return rows
+
+    def _write_rows(self, session, rows, progress):
+        """Commit one batch of rows (runs on the dedicated writer thread)."""
+        session.execute_write(self._write_batch, rows)
+        progress.update(len(rows))
+
+    @staticmethod
+    def _write_batch(tx, batch):
+        """Create one Document node per row in a single UNWIND statement."""
+        tx.run("UNWIND $rows AS row CREATE (d:Document) SET d = row", rows=batch)
     
     def query(self, query_text: str, top_k: int = 25) -> str:
         """